@@ -1,16 +1,37 @@
+import warnings
+
 import numpy as np
+import scipy.fft
+from scipy.linalg import eigh
 import emcee
 
 
-def autocorr(chains, time_axis=1, decorrelate=False, **kwargs):
-    """Use ``emcee.autocorr.integrated_time`` to estimate the autocorrelation
-    length.
+def autocorr(
+    chains,
+    time_axis=1,
+    decorrelate=False,
+    c=5,
+    tol=50,
+    quiet=False,
+    has_walkers=True,
+):
+    """Estimate the integrated autocorrelation length of multi-chain MCMC
+    samples, following ``emcee.autocorr.integrated_time``.
+
+    The autocorrelation function is computed for each walker separately and
+    then averaged over the walkers. The FFTs of all walkers and parameters are
+    done in a single batched call. The window size is chosen using Sokal's
+    procedure, as in emcee.
 
     Parameters
     ----------
     chains: np.ndarray (L, M, N,)
         An array containing multiple chains from multi-chain MCMC simulation.
-        The shape of the array should be (nwalkers, nsteps, ndim).
+        The shape of the array should be (nwalkers, nsteps, ndim). As in
+        ``emcee.autocorr.integrated_time``, a 1D time series (nsteps,) and 2D
+        arrays are also accepted. After moving the time axis to axis 0, a 2D
+        array is interpreted as (nsteps, nwalkers), or as (nsteps, ndim) if
+        ``has_walkers=False``.
     time_axis: int (Optional)
         Position of the time axis in the chains array. Typically, this is set to
         1, but for emcee, as an example, the chains output sometimes has the
@@ -19,8 +40,17 @@ def autocorr(chains, time_axis=1, decorrelate=False, **kwargs):
         A flag wheter to transform the chains to reduce correlation between
         parameters prior to computing the autocorrelation length. See
         `autocorrelation.decorrelate_chains` on how we reduce the correlation.
-    **kwargs: dict
-        Keyword arguments for ``emcee.autocorr.integrated_time``.
+    c: float (Optional)
+        The step size for the window search.
+    tol: float (Optional)
+        The minimum number of autocorrelation times needed to trust the
+        estimate.
+    quiet: bool (Optional)
+        If ``True``, give a warning instead of raising
+        ``emcee.autocorr.AutocorrError`` when the chain is too short.
+    has_walkers: bool (Optional)
+        Whether the second axis of a 2D array, after moving the time axis to
+        axis 0, should be interpreted as walkers or parameters.
 
     Returns
     -------
@@ -28,16 +58,69 @@ def autocorr(chains, time_axis=1, decorrelate=False, **kwargs):
         Estimated autocorrelation length for each parameter.
     """
 
-    if time_axis == 1:
+    chains = np.atleast_1d(chains)
+    if time_axis == 1 and chains.ndim > 1:
         # Swap the axes of the chains, so that the time axis is on the first
         # axis (this is the convention in emcee)
         chains = np.swapaxes(chains, 0, 1)
 
+    # Expand the chains to have the shape (nsteps, nwalkers, ndim), following
+    # emcee.autocorr.integrated_time
+    if chains.ndim == 1:
+        chains = chains[:, None, None]
+    elif chains.ndim == 2:
+        chains = chains[:, :, None] if has_walkers else chains[:, None, :]
+    elif chains.ndim != 3:
+        raise ValueError("invalid dimensions")
+
     if decorrelate:
         # Transform the chains to reduce correlation between parameters
         chains = decorrelate_chains(chains)
 
-    return emcee.autocorr.integrated_time(chains, **kwargs)
+    nsteps, _, ndim = chains.shape
+    acf = _autocorr_function(chains)
+    taus = 2.0 * np.cumsum(acf, axis=0) - 1.0
+    windows = _auto_window(taus, c)
+    tau_est = taus[windows, np.arange(ndim)]
+
+    # Check convergence
+    flag = tol * tau_est > nsteps
+    if np.any(flag):
+        msg = (
+            f"The chain is shorter than {tol} times the integrated "
+            f"autocorrelation time for {np.sum(flag)} parameter(s). Use this "
+            "estimate with caution and run a longer chain!\n"
+            f"N/{tol} = {nsteps / tol:.0f};\ntau: {tau_est}"
+        )
+        if not quiet:
+            raise emcee.autocorr.AutocorrError(tau_est, msg)
+        warnings.warn(msg)
+
+    return tau_est
+
+
+def _autocorr_function(chains):
+    """Compute the normalized autocorrelation function of each walker and
+    average them over the walkers. The chains should have the shape
+    (nsteps, nwalkers, ndim) and the output has the shape (nsteps, ndim).
+    """
+    nsteps = len(chains)
+    # Zero-pad to at least twice the length of the time series to avoid the
+    # circular correlation. The FFTs are parallelized over all available cores.
+    nfft = scipy.fft.next_fast_len(2 * nsteps, real=True)
+    f = scipy.fft.rfft(chains - np.mean(chains, axis=0), n=nfft, axis=0, workers=-1)
+    acf = scipy.fft.irfft(f.real**2 + f.imag**2, n=nfft, axis=0, workers=-1)[:nsteps]
+    acf /= acf[0]
+    return np.mean(acf, axis=1)
+
+
+def _auto_window(taus, c):
+    """Find the smallest window size M such that M >= c * tau(M), for each
+    parameter.
+    """
+    nsteps = len(taus)
+    m = np.arange(nsteps)[:, None] < c * taus
+    return np.where(np.any(m, axis=0), np.argmin(m, axis=0), nsteps - 1)
 
 
 def decorrelate_chains(chains):
@@ -64,14 +147,15 @@ def decorrelate_chains(chains):
     # Compute the mean to shift the center of the cloud of samples to the
     # origin.
     mean = np.mean(chain_combined, axis=0)
-    chains_shifted = chains - mean
     # Compute covariance of the samples. We use the covariance to rotate the
     # samples to minimize correlation between parameters.
-    cov = np.cov(chain_combined.T)
+    cov = np.atleast_2d(np.cov(chain_combined.T))
     # Get the eigenvectors of the covariance matrix
-    _, v = np.linalg.eigh(cov)
+    _, v = eigh(cov, driver="evr")
     # Use the eigenvectors to rotate the samples so that the transformed
-    # parameters are approximately independent to each other.
-    chain_rotated = chains_shifted @ v
+    # parameters are approximately independent to each other. The shift is
+    # applied after the rotation, so that the shifted chains are not stored.
+    chain_rotated = chains @ v
+    chain_rotated -= mean @ v
 
     return chain_rotated
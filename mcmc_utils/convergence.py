@@ -12,27 +12,34 @@ def rhat(chain, time_axis=1, return_WB=False):
         The MCMC chain as a ndarray, preferrably with the shape
         (nwalkers, nsteps, ndims). However, the shape can also be
         (nsteps, nwalkers, ndims), but the argument time_axis needs to be set
-        to 0.
+        to 0. To compute :math:`\\hat{r}` for several chains at once, e.g.,
+        from repeated simulations, stack them along leading batch axes, i.e.,
+        (..., nwalkers, nsteps, ndims). The within-chain covariance W is
+        expected to be positive definite. If it is singular, e.g., when a
+        parameter is fixed or is a linear combination of the other parameters,
+        the pseudo-inverse of W is used instead.
     time_axis: int (optional)
         Axis in which the time series is stored (0 or 1). For emcee results,
         the time series is stored in axis 0, but for ptemcee for a given
-        temperature, the time axis is 1.
+        temperature, the time axis is 1. For batched chains, this is the axis
+        position after the batch axes.
     return_WB: bool (optional)
         A flag to return covariance matrices within and between chains.
 
     Returns
     -------
-    r: float
-        Value of PSRF.
-    W, B: 2d ndarray
-        Matrices of covariance within and between the chains.
+    r: float or ndarray
+        Value of PSRF. For batched chains, this is an array with the shape of
+        the batch axes.
+    W, B: ndarray
+        Matrices of covariance within and between the chains, with shape
+        (..., ndims, ndims).
     """
     if not time_axis:
         # Reshape the chain so that the time axis is in axis 1
-        temp = _reshape_chain(chain)
-        chain = temp
+        chain = _reshape_chain(chain)
 
-    m, n, _ = chain.shape
+    m, n, _ = chain.shape[-3:]
     lambda1, W, B = _lambda1(chain)
     r = 1 - 1 / n + (1 + 1 / m) * lambda1
 
@@ -45,32 +52,54 @@ def rhat(chain, time_axis=1, return_WB=False):
 
 
 def _reshape_chain(chain):
-    """Reshape the chain and make so that the time series is in axis 1."""
-    reshaped_chain = np.swapaxes(chain, 0, 1)
-    return reshaped_chain
+    """Reshape the chain and make so that the time series is in axis 1, after
+    the batch axes. This returns a view of the chain.
+    """
+    return np.swapaxes(chain, -3, -2)
 
 
 def _B_over_n(chain):
     """Compute covariance matrix between the chains."""
-    return np.cov(np.mean(chain, axis=1), rowvar=False, ddof=1)
+    m = chain.shape[-3]
+    # Covariance of the chain means, computed from the centered means
+    M = np.mean(chain, axis=-2)
+    Mc = M - np.mean(M, axis=-2, keepdims=True)
+    return np.swapaxes(Mc, -1, -2) @ Mc / (m - 1)
 
 
 def _W(chain):
     """Compute the mean of the covariance matrix within each chain."""
-    m, n, nparams = chain.shape
-    Wm = np.empty((m, nparams, nparams))
-    for walker in range(m):
-        Wm[walker] = np.cov((chain[walker]), rowvar=False, ddof=1)
-    return np.mean(Wm, axis=0)
+    *batch, m, n, nparams = chain.shape
+    # Center each chain, then sum the outer products over the walkers and the
+    # time series at once, instead of computing the covariance of each chain
+    # separately and averaging them. Flattening the walker and time axes turns
+    # this into a single (batched) matrix product, which the BLAS library runs
+    # on multiple threads.
+    centered = chain - np.mean(chain, axis=-2, keepdims=True)
+    centered = centered.reshape(*batch, m * n, nparams)
+    return np.swapaxes(centered, -1, -2) @ centered / (m * (n - 1))
 
 
 def _lambda1(chain):
     """Compute the largest eigenvalue of :math:`W^{-1} B/n`."""
     W = _W(chain)
     B_over_n = _B_over_n(chain)
-    V = np.linalg.lstsq(W, B_over_n, rcond=-1)[0]
-    # # Force V to be symmetric, which it should be
-    # V = (V.T + V) / 2
-    # s = np.linalg.eigvalsh(V)
-    s = np.linalg.svd(V, compute_uv=False)
-    return np.max(s), W, B_over_n
+    # The eigenvalues of W^{-1} B/n are the solutions of the generalized
+    # symmetric eigenvalue problem B/n v = lambda W v. With the Cholesky
+    # factorization W = L L^T, they are the eigenvalues of the symmetric matrix
+    # L^{-1} B/n L^{-T}. All of these operations broadcast over the batch axes.
+    try:
+        L = np.linalg.cholesky(W)
+    except np.linalg.LinAlgError:
+        # W is singular, e.g., when a parameter is fixed or is a linear
+        # combination of the other parameters. Fall back to the pseudo-inverse
+        # of W, like a least squares solution of W V = B/n.
+        V = np.linalg.pinv(W) @ B_over_n
+        lambda1 = np.max(np.linalg.eigvals(V).real, axis=-1)
+        return lambda1, W, B_over_n
+    # L is triangular, but np.linalg.solve is used instead of a triangular
+    # solver because it broadcasts over the batch axes.
+    Linv_B = np.linalg.solve(L, B_over_n)
+    V = np.linalg.solve(L, np.swapaxes(Linv_B, -1, -2))
+    lambda1 = np.linalg.eigvalsh(V)[..., -1]
+    return lambda1, W, B_over_n
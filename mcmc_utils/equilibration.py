@@ -1,11 +1,32 @@
 import numpy as np
 
 
-def _standard_error_squared(chain: np.ndarray) -> float:
-    """Compute the square of the standard error."""
-    nn = len(chain)
-    se2 = np.var(chain) / nn
-    return se2
+def _standard_error_squared(
+    chain: np.ndarray, ds: np.ndarray, dtype=np.float64
+) -> np.ndarray:
+    """Compute the square of the standard error of ``chain[d:]`` for every
+    ``d`` in ``ds``, using cumulative sums of the first and second moments.
+    """
+    length = len(chain)
+    # Shift the chain by its last element to reduce cancellation in the
+    # one-pass variance formula below. This also makes a tail that stays at the
+    # last value (e.g., a stuck walker) exactly zero, so its variance is
+    # exactly zero, as with ``np.var``. The shift is done in the precision of
+    # the input, before casting to ``dtype``, so that an offset in the data
+    # doesn't cost precision when ``dtype`` is lower precision than the input.
+    c = np.asarray(chain)
+    c = (c - c[-1]).astype(dtype, copy=False)
+    # Suffix sums, i.e., S1[d] = sum(c[d:]), accumulated from the end of the
+    # chain so that the tail sums are not differences of large prefix sums
+    S1 = np.cumsum(c[::-1])[::-1]
+    S2 = np.cumsum((c * c)[::-1])[::-1]
+    # Number of elements, sum, and sum of squares of each tail chain[d:]
+    nn = (length - ds).astype(c.dtype)
+    sum_tail = S1[ds]
+    sq_tail = S2[ds]
+    # Clip the rounding errors that can make the variance slightly negative
+    var = np.maximum(sq_tail / nn - (sum_tail / nn) ** 2, 0)
+    return var / nn
 
 
 def mser(
@@ -14,12 +35,13 @@ def mser(
     dstep: int = 10,
     dmax: int = -1,
     full_output: bool = False,
+    dtype=np.float64,
 ) -> int:
     """Estimate the equilibration time using marginal standard error rule
     (MSER). This is done by calculating the standard error (square) of chain_d,
     where chain_d contains the last n-d element of the chain, for progresively
     larger d values, starting from dmin, incremented by dstep. The SE values
-    are stored in a list. Then we search the minimum element in the list and
+    are stored in an array. Then we search the minimum element in the array and
     return the index of that element. To speed up the process, window width can
     be specified. The chain will be redefined to be the mean of the elements in
     every window.
@@ -35,28 +57,34 @@ def mser(
     dmax: int
         Index where to stop the search in the time series.
     full_output: bool
-        A flag to return the list of squared standard error.
+        A flag to return the array of squared standard error.
+    dtype: data-type
+        Floating point type used to compute the standard errors. Using
+        ``np.float32`` halves the memory traffic for long chains, at the cost
+        of precision in the accumulated sums. The chain is shifted by its last
+        element before the sums, which removes any constant offset, but the
+        rounding error of the (uncompensated) cumulative sums still grows with
+        the length of the chain. Use the default ``np.float64`` for very long
+        chains or when the fluctuations are small compared to the drift.
 
     Returns
     -------
     dstar: int or dict
         Estimate of the equilibration time using MSER. If ``full_output=True``,
         then a dictionary containing the estimated equilibration time and the
-        list of squared standard errors will be returned.
+        array of squared standard errors will be returned.
     """
     length = len(chain)
 
     # Compute the SE square
-    SE2_list = [
-        _standard_error_squared(chain[dd:])
-        for dd in range(length)[dmin:dmax:dstep]
-    ]
+    ds = np.arange(length)[dmin:dmax:dstep]
+    SE2 = _standard_error_squared(chain, ds, dtype)
 
     # Get the estimate of the equilibration time, wrt the original time series
-    dtemp = np.argmin(SE2_list)
+    dtemp = np.argmin(SE2)
     dstar = min([dmin + (dtemp + 1) * dstep, length])
 
     if full_output:
-        return {"dstar": dstar, "SE2": SE2_list}
+        return {"dstar": dstar, "SE2": SE2}
     else:
         return dstar
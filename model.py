@@ -42,10 +42,38 @@ class BaseModel:
         self.data_error = 1.0 if data_error is None else data_error
 
         # Parameter transform
-        if transform is None:
-            self.transform = default_transform
-        else:
-            self.transform = transform
+        self.transform = transform
+
+    @property
+    def transform(self):
+        """Parameter transformation function."""
+        return self._transform
+
+    @transform.setter
+    def transform(self, value):
+        # Keep track of whether the transform is the identity, so that the
+        # predict methods can skip calling it
+        self._identity_transform = value is None or value is default_transform
+        self._transform = default_transform if value is None else value
+
+    @property
+    def data_error(self):
+        """Error bar for each data value. This is a read-only copy of the error
+        bars; to change them, assign a new value to this attribute.
+        """
+        return self._data_error
+
+    @data_error.setter
+    def data_error(self, value):
+        # Store a read-only copy of the error bars, together with their
+        # reciprocal, so that the residual can be computed with a multiplication
+        # instead of a division. The copy is read-only so that in-place changes,
+        # which would not update the reciprocal, raise an error.
+        error = np.array(value)
+        error = error.astype(np.result_type(error.dtype, float), copy=False)
+        error.flags.writeable = False
+        self._data_error = error
+        self._inv_data_error = 1.0 / error
 
     def predict(self, params):
         """Evaluate the model at the given parameters."""
@@ -67,7 +95,7 @@ class BaseModel:
         """
         check_data(self.data, self.data_error)
         preds = self.predict(params)
-        return (self.data - preds) / self.data_error
+        return (self.data - preds) * self._inv_data_error
 
     def cost(self, params: np.ndarray) -> float:
         """Evaluate the weighted least squares cost at the given parameter values.
@@ -83,9 +111,8 @@ class BaseModel:
             Cost value.
 
         """
-        check_data(self.data, self.data_error)
         res = self.residual(params)
-        return 0.5 * np.linalg.norm(res) ** 2
+        return 0.5 * (res @ res)
 
 
 class LinearModel(BaseModel):
@@ -128,7 +155,7 @@ class LinearModel(BaseModel):
         super().__init__(N, len(t), data, data_error, transform)
 
         # Design matrix
-        self.J = np.array([t**n for n in range(self.N)]).T
+        self.J = np.vander(t, self.N, increasing=True)
 
     def predict(self, params: np.ndarray) -> np.ndarray:
         """Evaluate the model at the given parameters.
@@ -144,7 +171,7 @@ class LinearModel(BaseModel):
             Predictions of the model.
 
         """
-        x = self.transform(params)
+        x = params if self._identity_transform else self.transform(params)
         return self.J @ x
 
 
@@ -185,6 +212,10 @@ class FractionalModel(BaseModel):
         self.t = t
         super().__init__(N, len(t), data, data_error, transform)
 
+        # Design matrix of the polynomial in the denominator, with the last
+        # column containing t^N
+        self.J = np.vander(t, self.N + 1, increasing=True)
+
     def predict(self, params):
         """Evaluate the model at the given parameters.
 
@@ -199,9 +230,8 @@ class FractionalModel(BaseModel):
             Predictions of the model.
 
         """
-        x = self.transform(params)
-        denom_elems = np.array([xi * self.t**ii for ii, xi in enumerate(x)])
-        return 1 / (np.sum(denom_elems, axis=0) + self.t**self.N)
+        x = params if self._identity_transform else self.transform(params)
+        return 1 / (self.J[:, :-1] @ x + self.J[:, -1])
 
 
 class ExponentialModel(BaseModel):
@@ -256,9 +286,8 @@ class ExponentialModel(BaseModel):
             Predictions of the model.
 
         """
-        x = self.transform(params)
-        terms = np.array([np.exp(-par * self.t) for par in x])
-        return np.sum(terms, axis=0) / self.N
+        x = params if self._identity_transform else self.transform(params)
+        return np.mean(np.exp(-np.outer(x, self.t)), axis=0)
 
 
 def check_data(data, error):